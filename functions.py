@@ -1,45 +1,55 @@
+import copy
 import torch
 from torch.utils.data import DataLoader
 import numpy as np
-from sklearn.metrics import mean_squared_error
 from sklearn.neural_network import MLPClassifier
 from sklearn import tree
 from ReliabilityPackage.ReliabilityClasses import AE, ReliabilityDetector, DensityPrincipleDetector
-from ReliabilityPackage.ReliabilityPrivateFunctions import _train_one_epoch, _compute_synpts_accuracy, _val_scores_diff_mse, \
-    _contains_only_integers, _extract_values_proportionally
+from ReliabilityPackage.ReliabilityPrivateFunctions import _compute_synpts_accuracy, _val_scores_diff_mse
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
 
 # Functions
 
 
-def create_autoencoder(layer_sizes):
+def create_autoencoder(layer_sizes, compile_model=False):
     """
     Gets an autoencoder model with the specified sizes of the layers.
 
     This function gets an autoencoder model using the `AE` class, implemented as a PyTorch module, with the specified
     layers' sizes.
     The autoencoder is used for the implementation of the Density Principle.
+    If `compile_model` is True, the model is compiled with `torch.compile`: the compilation happens on the first
+    forward pass, which is therefore noticeably slower than the following ones, and requires a platform supported by
+    TorchInductor.
 
     :param list layer_sizes: A list containing the number of nodes of each layer of the encoder (decoder built with
      symmetry).
+    :param bool compile_model: Whether to compile the model with `torch.compile` (default: False).
 
     :return: An instance of the autoencoder model.
     :rtype: ReliabilityClasses.AE
     """
     ae = AE(layer_sizes)
+    if compile_model:
+        ae = torch.compile(ae)
     return ae
 
 
 def train_autoencoder(ae, training_set, validation_set, batchsize, epochs=1000, optimizer=None,
-                      loss_function=torch.nn.MSELoss(),
+                      loss_function=torch.nn.MSELoss(), use_amp=True, num_workers=0,
                       ):
     """
     Trains the autoencoder model using the provided training and validation sets.
 
-    This function trains the autoencoder model using the provided training and validation sets.
-    It performs multiple epochs of training, updating the model parameters based on the specified optimizer
+    This function trains the autoencoder model using the provided training and validation sets, on the GPU if one is
+    available. It performs multiple epochs of training, updating the model parameters based on the specified optimizer
     and loss function. The training progress is evaluated on the validation set after each epoch, and the resulting
     validation loss is shown in the image.
 
@@ -52,15 +62,28 @@ def train_autoencoder(ae, training_set, validation_set, batchsize, epochs=1000,
         If None, an Adam optimizer with default parameters will be used (default: None).
     :param torch.nn.Module loss_function: The loss function used for training.
         If None, the mean squared error (MSE) loss function will be used (default: torch.nn.MSELoss()).
+    :param bool use_amp: Whether to train with automatic mixed precision, i.e. float16 autocast with gradient scaling,
+        when training on CUDA. It has no effect on CPU, where training always runs in float32 (default: True).
+    :param int num_workers: The number of worker processes used to load the batches. With the default value, the
+        batches are loaded in the main process (default: 0).
 
     :return: The trained autoencoder model.
     :rtype: torch.nn.Module
     """
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    ae.to(device)
+
     if optimizer is None:
         optimizer = torch.optim.Adam(ae.parameters(), lr=1e-4, weight_decay=1e-8)
 
-    training_loader = DataLoader(dataset=training_set, batch_size=batchsize, shuffle=True)
-    validation_loader = DataLoader(dataset=validation_set, batch_size=batchsize, shuffle=True)
+    use_amp = use_amp and device.type == 'cuda'
+    amp_dtype = torch.float16
+    scaler = torch.amp.GradScaler('cuda', enabled=use_amp)
+
+    training_loader = _get_data_loader(training_set, batchsize, True, device, num_workers)
+    validation_loader = _get_data_loader(validation_set, batchsize, False, device, num_workers)
+    if len(training_loader) == 0 or len(validation_loader) == 0:
+        raise ValueError("The training and validation sets must contain at least one sample.")
 
     validation_loss = []
     epoch_number = 0
@@ -68,16 +91,19 @@ def train_autoencoder(ae, training_set, validation_set, batchsize, epochs=1000,
     for epoch in range(epochs):
         print('EPOCH {}'.format(epoch_number + 1))
         ae.train(True)
-        avg_loss = _train_one_epoch(epoch_number, training_set, training_loader, optimizer, loss_function, ae)
-        ae.train(False)
+        avg_loss = _train_one_epoch_amp(ae, training_loader, optimizer, loss_function, device, amp_dtype, use_amp,
+                                        scaler)
+        ae.eval()
         running_vloss = 0.0
-        for i, vdata in enumerate(validation_loader):
-            vinputs = vdata
-            voutputs = ae(vinputs.float())
-            vloss = loss_function(voutputs, vinputs.float())
-            running_vloss += vloss
-        avg_vloss = running_vloss / (i + 1)
-        validation_loss.append(avg_vloss.tolist())
+        with torch.inference_mode():
+            for vdata in validation_loader:
+                vinputs = vdata.to(device, non_blocking=True)
+                with torch.autocast(device_type=device.type, dtype=amp_dtype, enabled=use_amp):
+                    voutputs = ae(vinputs)
+                    vloss = loss_function(voutputs, vinputs)
+                running_vloss += vloss.item()
+        avg_vloss = running_vloss / len(validation_loader)
+        validation_loss.append(avg_vloss)
         epoch_number += 1
 
     fig, ax = plt.subplots()
@@ -86,19 +112,22 @@ def train_autoencoder(ae, training_set, validation_set, batchsize, epochs=1000,
     plt.ylabel('Validation Loss')
     plt.title('Loss')
     plt.show()
+    # the detectors feed the autoencoder with CPU tensors
+    ae.to('cpu')
     return ae
 
 
 def get_and_train_autoencoder(training_set, validation_set, batchsize, layer_sizes=None, epochs=1000,
-                                 optimizer=None, loss_function=torch.nn.MSELoss(),
+                                 optimizer=None, loss_function=torch.nn.MSELoss(), use_amp=True,
+                                 num_workers=0, compile_model=False,
                                  ):
     """
     Gets and trains an autoencoder model using the provided training and validation sets.
 
     This function gets an autoencoder model based on the specified layers' sizes and trains it using
-    the provided training and validation sets. It performs multiple epochs of training, updating the model
-    parameters based on the specified optimizer and loss function. The training progress is evaluated on
-    the validation set after each epoch, and the resulting validation loss is shown in the image.
+    the provided training and validation sets, on the GPU if one is available. It performs multiple epochs of training,
+    updating the model parameters based on the specified optimizer and loss function. The training progress is
+    evaluated on the validation set after each epoch, and the resulting validation loss is shown in the image.
 
     :param numpy.ndarray training_set: The training set.
     :param numpy.ndarray validation_set: The validation set.
@@ -112,6 +141,11 @@ def get_and_train_autoencoder(training_set, validation_set, batchsize, layer_siz
         If None, an Adam optimizer with default parameters will be used (default: None).
     :param torch.nn.Module loss_function: The loss function used for training.
         If None, the mean squared error (MSE) loss function will be used (default: torch.nn.MSELoss()).
+    :param bool use_amp: Whether to train with automatic mixed precision, i.e. float16 autocast with gradient scaling,
+        when training on CUDA. It has no effect on CPU, where training always runs in float32 (default: True).
+    :param int num_workers: The number of worker processes used to load the batches. With the default value, the
+        batches are loaded in the main process (default: 0).
+    :param bool compile_model: Whether to compile the model with `torch.compile` (default: False).
 
     :return: The trained autoencoder model.
     :rtype: torch.nn.Module
@@ -119,39 +153,9 @@ def get_and_train_autoencoder(training_set, validation_set, batchsize, layer_siz
     if layer_sizes is None:
         dim_input = training_set.shape[1]
         layer_sizes = [dim_input, dim_input + 4, dim_input + 8, dim_input + 16, dim_input + 32]
-    ae = AE(layer_sizes)
-
-    if optimizer is None:
-        optimizer = torch.optim.Adam(ae.parameters(), lr=1e-4, weight_decay=1e-8)
-
-    training_loader = DataLoader(dataset=training_set, batch_size=batchsize, shuffle=True)
-    validation_loader = DataLoader(dataset=validation_set, batch_size=batchsize, shuffle=True)
-
-    validation_loss = []
-    epoch_number = 0
-
-    for epoch in range(epochs):
-        print('EPOCH {}'.format(epoch_number + 1))
-        ae.train(True)
-        avg_loss = _train_one_epoch(epoch_number, training_set, training_loader, optimizer, loss_function, ae)
-        ae.train(False)
-        running_vloss = 0.0
-        for i, vdata in enumerate(validation_loader):
-            vinputs = vdata
-            voutputs = ae(vinputs.float())
-            vloss = loss_function(voutputs, vinputs.float())
-            running_vloss += vloss
-        avg_vloss = running_vloss / (i + 1)
-        validation_loss.append(avg_vloss.tolist())
-        epoch_number += 1
-
-    fig, ax = plt.subplots()
-    plt.plot(validation_loss)
-    plt.xlabel('epochs')
-    plt.ylabel('Validation Loss')
-    plt.title('Loss')
-    plt.show()
-    return ae
+    ae = create_autoencoder(layer_sizes, compile_model)
+    return train_autoencoder(ae, training_set, validation_set, batchsize, epochs, optimizer, loss_function, use_amp,
+                             num_workers)
 
 
 def compute_dataset_avg_mse(ae, X):
@@ -164,13 +168,10 @@ def compute_dataset_avg_mse(ae, X):
     :return: The average MSE value for the reconstructed samples.
     :rtype: float
     """
-    mse = []
-    for i in range(len(X)):
-        mse.append(mean_squared_error(X[i],  ae((torch.tensor(X[i, :])).float()).detach().numpy()))
-    return np.mean(mse)
+    return _reconstruction_mse(ae, X).mean().item()
 
 
-def generate_synthetic_points(predict_func, X_train, y_train, method='GN', k=5):
+def generate_synthetic_points(predict_func, X_train, y_train, method='GN', k=5, random_state=None):
     """
     Generates synthetic points based on the specified method.
 
@@ -182,6 +183,9 @@ def generate_synthetic_points(predict_func, X_train, y_train, method='GN', k=5):
     :param numpy.ndarray X_train: The training set with shape (n_samples, n_features).
     :param str method: The method used to generate synthetic points (default: 'GN').
         Currently, only the 'GN' (Gaussian Noise) method is supported.
+    :param int random_state: The seed of the random number generator used to generate the synthetic points.
+        If None, the seed is drawn from NumPy's global random state, so that the synthetic points can still be made
+        reproducible with `np.random.seed` (default: None).
 
     :return: The synthetic points generated with the specified method.
     :rtype: numpy.ndarray
@@ -191,17 +195,26 @@ def generate_synthetic_points(predict_func, X_train, y_train, method='GN', k=5):
         raise ValueError(f"Invalid value for method. Allowed values are {allowed_methods}.")
 
     if method == 'GN':
-        noisy_data = X_train.copy()
+        n_samples = X_train.shape[0]
+        is_int = np.array([_is_integer_column(X_train[:, i]) for i in range(X_train.shape[1])], dtype=bool)
+        int_cols = np.flatnonzero(is_int)
+        cont_cols = np.flatnonzero(~is_int)
+        X_cont = X_train[:, cont_cols]
+        tables = {i: _values_probabilities(X_train[:, i]) for i in int_cols}
+        if random_state is None:
+            random_state = np.random.randint(2 ** 31 - 1)
+        rng = np.random.default_rng(random_state)
+        noise_dtype = np.float32 if X_train.dtype == np.float32 else np.float64
+        noisy_data = np.empty((6 * n_samples, X_train.shape[1]), dtype=X_train.dtype)
+        noisy_data[:n_samples] = X_train
         for j in range(2, 7):
-            noisy_data_temp = X_train.copy()
-            for i in range(X_train.shape[1]):
-                if _contains_only_integers(X_train[:, i]):
-                    noisy_data_temp[:, i] = _extract_values_proportionally(X_train[:, i])
-                else:
-                    noise = np.random.normal(0, j * 0.1, size=X_train.shape[0])
-                    noisy_data_temp[:, i] += noise
-
-            noisy_data = np.concatenate((noisy_data, noisy_data_temp))
+            noisy_data_temp = noisy_data[(j - 1) * n_samples:j * n_samples]
+            noise = rng.standard_normal(X_cont.shape, dtype=noise_dtype)
+            noise *= j * 0.1
+            noisy_data_temp[:, cont_cols] = X_cont + noise
+            for i in int_cols:
+                vals, probs = tables[i]
+                noisy_data_temp[:, i] = rng.choice(vals, size=n_samples, p=probs)
 
     acc_syn = _compute_synpts_accuracy(predict_func, noisy_data, X_train, y_train, k)
 
@@ -223,13 +236,9 @@ def perc_mse_threshold(ae, validation_set, perc=95):
     :return: The MSE threshold as the specified percentile of the MSE of the validation set.
     :rtype: float
     """
-    val_projections = []
-    mse_val = []
-    for i in range(len(validation_set)):
-        val_projections.append(ae((torch.tensor(validation_set[i, :])).float()))
-        mse_val.append(mean_squared_error(validation_set[i], val_projections[i].detach().numpy()))
+    mse_val = _reconstruction_mse(ae, validation_set)
 
-    return np.percentile(mse_val, perc)
+    return np.percentile(mse_val.numpy(), perc)
 
 
 def mse_threshold_plot(ae, X_val, y_val, predict_func, metric='f1_score'):
@@ -288,50 +297,38 @@ def mse_threshold_plot(ae, X_val, y_val, predict_func, metric='f1_score'):
     fig.update_yaxes(range=[min(y_unrel + y_rel), max(y_unrel + y_rel)])
     # fig.update_xaxes(tickformat=".2e")
 
-    for step in range(len(percentiles)):
-        fig.add_trace(
-            go.Scatter(
-                x=percentiles[:step + 2],
-                y=y_rel[:step + 2],
-                visible=False,
-                name='Reliable ' + metric,
-                mode='lines',
-                line=dict(color='lightgreen'),
-                customdata=[[perc, num] for perc, num in zip(perc_rel[:step + 2], num_rel[:step + 2])],
-                hovertemplate='%{y:.3f}<br>Reliable samples: %{customdata[1]} (%{customdata[0]}%)',
-            )
+    fig.add_trace(
+        go.Scatter(
+            x=percentiles,
+            y=y_rel,
+            name='Reliable ' + metric,
+            mode='lines',
+            line=dict(color='lightgreen'),
+            customdata=list(zip(perc_rel, num_rel)),
+            hovertemplate='%{y:.3f}<br>Reliable samples: %{customdata[1]} (%{customdata[0]}%)',
         )
-    for step in range(len(percentiles)):
-        fig.add_trace(
-            go.Scatter(
-                x=percentiles[:step + 2],
-                y=y_unrel[:step + 2],
-                visible=False,
-                name='Unreliable ' + metric,
-                mode='lines',
-                line=dict(color='salmon'),
-                customdata=[[perc, num] for perc, num in zip(perc_unrel[:step + 2], num_unrel[:step + 2])],
-                hovertemplate='%{y:.3f}<br>Unreliable samples: %{customdata[1]} (%{customdata[0]}%)',
-            )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=percentiles,
+            y=y_unrel,
+            name='Unreliable ' + metric,
+            mode='lines',
+            line=dict(color='salmon'),
+            customdata=list(zip(perc_unrel, num_unrel)),
+            hovertemplate='%{y:.3f}<br>Unreliable samples: %{customdata[1]} (%{customdata[0]}%)',
         )
-    # Create and add slider
+    )
+    # Create and add slider: each step only moves the upper limit of the x-axis
     steps = []
-    for i in range(int(len(fig.data) / 2)):
+    for i in range(len(percentiles)):
         step = dict(
-            method="update",
+            method="relayout",
             label=str(percentiles[i]) + "°-P",
-            args=[{"visible": [False] * len(fig.data)},
-                  {"title": str(metric) + " variation on the validation set at different values of the MSE threshold"},
-                  {"x": [percentiles[:i + 2]]},  # Update x-axis data
-                  ],
+            args=[{"xaxis.range": [percentiles[0], percentiles[min(i + 1, len(percentiles) - 1)]]}],
         )
-        step["args"][0]["visible"][i] = True  # Toggle i'th trace to "visible"
-        step["args"][0]["visible"][int(len(fig.data) / 2) + i] = True
         steps.append(step)
 
-    # Make last traces visible
-    fig.data[len(percentiles) - 1].visible = True
-    fig.data[2 * len(percentiles) - 1].visible = True
     sliders = [dict(
         active=len(percentiles) - 1,
         # currentvalue={"prefix": "MSE x-limit: "},
@@ -344,6 +341,7 @@ def mse_threshold_plot(ae, X_val, y_val, predict_func, metric='f1_score'):
         hovermode="x unified",
         xaxis=dict(
             # tickformat='.2e',
+            range=[percentiles[0], percentiles[-1]],
             title='MSE threshold'
         ),
         title=str(metric) + " variation on the validation set at different values of the MSE threshold"
@@ -398,57 +396,55 @@ def mse_threshold_barplot(ae, X_val, y_val, predict_func):
               'lightgreen', 'salmon',
               'lightgreen', 'salmon']
 
-    # Add traces, one for each slider step
+    # Compute the bars of each slider step
+    ybars = []
     for step in range(len(mse_threshold_list)):
-        ybar = [perc_unrel[step],
-                rel_scores[step][0], unrel_scores[step][0],
-                rel_scores[step][1], unrel_scores[step][1],
-                rel_scores[step][2], unrel_scores[step][2],
-                rel_scores[step][3], unrel_scores[step][3],
-                rel_scores[step][4], unrel_scores[step][4],
-                rel_scores[step][5], unrel_scores[step][5],
-                ]
-        format_ybar = ["{:.3f}".format(val) for val in ybar]
-        fig.add_trace(
-            go.Bar(
-                x=['% UR',
-                   'R-Bal Accuracy', 'UR-Bal Accuracy',
-                   'R-Precision', 'UR-Precision',
-                   'R-Recall', 'UR-Recall',
-                   'R-f1', 'UR-f1',
-                   'R-MCC', 'UR-MCC',
-                   'R-brier score', 'UR-brier score'
-                   ],
-                y=ybar,
-                visible=False,
-                marker=dict(color=colors),
-                name='',
-                width=0.8,
-                text=format_ybar,
-                showlegend=False,
-                hovertext=hovertext,
-                hoverinfo='text'
-            )
+        ybars.append([perc_unrel[step],
+                      rel_scores[step][0], unrel_scores[step][0],
+                      rel_scores[step][1], unrel_scores[step][1],
+                      rel_scores[step][2], unrel_scores[step][2],
+                      rel_scores[step][3], unrel_scores[step][3],
+                      rel_scores[step][4], unrel_scores[step][4],
+                      rel_scores[step][5], unrel_scores[step][5],
+                      ])
+    format_ybars = [["{:.3f}".format(val) for val in ybar] for ybar in ybars]
+
+    # Add a single trace, whose bars are updated by the slider
+    fig.add_trace(
+        go.Bar(
+            x=['% UR',
+               'R-Bal Accuracy', 'UR-Bal Accuracy',
+               'R-Precision', 'UR-Precision',
+               'R-Recall', 'UR-Recall',
+               'R-f1', 'UR-f1',
+               'R-MCC', 'UR-MCC',
+               'R-brier score', 'UR-brier score'
+               ],
+            y=ybars[49],
+            marker=dict(color=colors),
+            name='',
+            width=0.8,
+            text=format_ybars[49],
+            showlegend=False,
+            hovertext=hovertext,
+            hoverinfo='text'
         )
+    )
 
     # Create and add slider
     steps = []
-    for i in range(len(fig.data)):
+    for i in range(len(ybars)):
         step = dict(
             method="update",
             label=str(i + 2) + "°-P",
-            args=[{"visible": [False] * len(fig.data)},
+            args=[{"y": [ybars[i]], "text": [format_ybars[i]]},
                   {"title": "MSE threshold: " + str('{:.4e}'.format(mse_threshold_list[i])) + ": " + str(
                       i + 1) + "°-percentile" +
                             " --- # Unreliable: " + str(num_unrel[i]) +
                             " (" + str('{:.2f}'.format(perc_unrel[i] * 100)) + "%)"}],  # layout attribute
         )
-        step["args"][0]["visible"][i] = True  # Toggle i'th trace to "visible"
         steps.append(step)
 
-    # Make 10th trace visible
-    fig.data[49].visible = True
-
     sliders = [dict(
         active=49,
         currentvalue={"prefix": "MSE threshold: "},
@@ -466,7 +462,31 @@ def mse_threshold_barplot(ae, X_val, y_val, predict_func):
     return fig
 
 
-def density_predictor(ae, mse_thresh):
+def freeze_ae(ae, example_input):
+    """
+    Gets a frozen TorchScript version of the autoencoder model, to be used for inference only.
+
+    This function traces the autoencoder (in evaluation mode) on the example input with `torch.jit.trace`, and freezes
+    the resulting module with `torch.jit.freeze`, which inlines the parameters and fuses the operations where possible.
+    The tracing is done on a CPU copy of the autoencoder, so the model passed is left unchanged (device and training
+    mode) and the frozen module always runs on the CPU, like the detectors' inputs. Autoencoders compiled with
+    `torch.compile` are unwrapped before tracing; already frozen modules are returned as they are.
+
+    :param torch.nn.Module ae: The autoencoder model.
+    :param array-like example_input: A sample (or a batch of samples) of the dataset, used for tracing.
+
+    :return: The frozen autoencoder model, on the CPU.
+    :rtype: torch.jit.ScriptModule
+    """
+    if isinstance(ae, torch.jit.ScriptModule):
+        return ae
+    ae = copy.deepcopy(getattr(ae, '_orig_mod', ae)).to('cpu').eval()
+    example_input = torch.as_tensor(np.asarray(example_input)).float()
+    with torch.no_grad():
+        return torch.jit.freeze(torch.jit.trace(ae, example_input))
+
+
+def density_predictor(ae, mse_thresh, example_input=None):
     """
     Creates a DensityPrinciplePredictor object for a given autoencoder and MSE threshold.
 
@@ -476,15 +496,19 @@ def density_predictor(ae, mse_thresh):
 
     :param torch.nn.Module ae: The autoencoder used for projection.
     :param float mse_thresh: The MSE threshold used for assigning reliability scores.
+    :param array-like example_input: A sample of the dataset. If provided, the autoencoder is traced on it and frozen
+        with `freeze_ae` (default: None).
 
     :return: A DensityPrinciplePredictor object.
     :rtype: DensityPrincipleDetector
     """
+    if example_input is not None:
+        ae = freeze_ae(ae, example_input)
     DP = DensityPrincipleDetector(ae, mse_thresh)
     return DP
 
 
-def create_reliability_detector(ae, syn_pts, acc_syn, mse_thresh, acc_thresh, proxy_model='MLP'):
+def create_reliability_detector(ae, syn_pts, acc_syn, mse_thresh, acc_thresh, proxy_model='MLP', freeze_model=False):
     """
     Gets a ReliabilityPredictor object for a given autoencoder, synthetic points, accuracy of the synthetic points,
     MSE threshold, and accuracy threshold.
@@ -502,23 +526,30 @@ def create_reliability_detector(ae, syn_pts, acc_syn, mse_thresh, acc_thresh, pr
     :param float mse_thresh: The MSE threshold used for assigning the density reliability scores.
     :param float acc_thresh: The accuracy threshold used for assigning the "local-fit" reliability scores.
     :param str proxy_model: The type of proxy model used for training the "local-fit"reliability predictor.
-        Available options: 'MLP', 'tree'. Default is 'MLP' (Multi-Layer Perceptron).
+        Available options: 'MLP', 'tree', 'torch_mlp'. Default is 'MLP' (Multi-Layer Perceptron). 'torch_mlp' is a
+        small PyTorch MLP trained and evaluated on the device of the autoencoder, on whole batches of samples. Since
+        `train_autoencoder` returns the autoencoder on the CPU, the MLP runs on the CPU unless the autoencoder is moved
+        to the GPU before calling this function.
+    :param bool freeze_model: Whether to trace the autoencoder on the synthetic points and freeze it with `freeze_ae`.
+        The frozen module can only be used for inference (default: False).
 
     :return: A ReliabilityPackage object.
     :rtype: ReliabilityDetector
     """
-    allowed_proxy_model = ['MLP', 'tree']
+    allowed_proxy_model = ['MLP', 'tree', 'torch_mlp']
     if proxy_model not in allowed_proxy_model:
         raise ValueError(f"Invalid value for proxy_model. Allowed values are {allowed_proxy_model}.")
-    y_syn_pts = []
-    for i in range(len(acc_syn)):
-        y_syn_pts.append(1) if acc_syn[i] >= acc_thresh else y_syn_pts.append(0)
+    y_syn_pts = (np.asarray(acc_syn) >= acc_thresh).astype(np.int8)
 
     if proxy_model == 'MLP':
         clf = MLPClassifier(activation="tanh", random_state=42, max_iter=1000).fit(syn_pts, y_syn_pts)
     elif proxy_model == 'tree':
         clf = tree.DecisionTreeClassifier(random_state=42).fit(syn_pts, y_syn_pts)
+    elif proxy_model == 'torch_mlp':
+        clf = _TorchMLPProxy(_fit_torch_mlp(syn_pts, y_syn_pts, _module_device(ae)))
 
+    if freeze_model:
+        ae = freeze_ae(ae, np.asarray(syn_pts)[:1])
     RP = ReliabilityDetector(ae, clf, mse_thresh)
 
     return RP
@@ -529,7 +560,10 @@ def compute_dataset_reliability(RD, X, mode='total'):
     Computes the reliability of the samples in a dataset
 
     This function computes the density/local-fit/total reliability of the samples in the X dataset, based on the mode
-    specified, with the ReliabilityPackage RD
+    specified, with the ReliabilityPackage RD. If RD exposes its autoencoder and MSE threshold (`ae`, `mse_thresh`)
+    and its proxy model (`clf`), the whole dataset is processed at once: the density reliability with a single
+    (chunked) autoencoder forward pass, and the local-fit reliability with a single prediction of the proxy model.
+    Otherwise, the `compute_*_reliability` methods of RD are called on each sample.
     :param ReliabilityDetector RD: A ReliabilityPackage object.
     :param array-like X: the specified dataset
     :param str mode: the type of reliability to compute; Available options: 'density', 'local-fit', 'total'. Default is
@@ -537,9 +571,263 @@ def compute_dataset_reliability(RD, X, mode='total'):
     :return: a numpy 1-D array containing the reliability of each sample (1 for reliable, 0 for unreliable)
     :rtype: numpy.ndarray
     """
+    X = np.asarray(X)
     if mode == 'total':
-        return np.asarray([RD.compute_total_reliability(x) for x in X])
+        return _density_reliability(RD, X) & _localfit_reliability(RD, X)
     elif mode == 'density':
-        return np.asarray([RD.compute_density_reliability(x) for x in X])
+        return _density_reliability(RD, X)
     elif mode == 'local-fit':
+        return _localfit_reliability(RD, X)
+
+
+# Private functions
+
+
+def _get_data_loader(dataset, batchsize, shuffle, device, num_workers):
+    """
+    Gets a DataLoader over a dataset, converted once to a float32 tensor.
+
+    When training on CUDA, the batches are placed in pinned memory so that they can be copied asynchronously to the GPU.
+    If `num_workers` is greater than 0, they are loaded by that number of persistent worker processes.
+
+    :param numpy.ndarray dataset: The dataset with shape (n_samples, n_features).
+    :param int batchsize: The batch size.
+    :param bool shuffle: Whether to reshuffle the samples at every epoch.
+    :param torch.device device: The device the batches will be moved to.
+    :param int num_workers: The number of worker processes used to load the batches.
+
+    :return: The DataLoader over the dataset.
+    :rtype: torch.utils.data.DataLoader
+    """
+    return DataLoader(dataset=torch.as_tensor(np.asarray(dataset), dtype=torch.float32), batch_size=batchsize,
+                      shuffle=shuffle, num_workers=num_workers, pin_memory=(device.type == 'cuda'),
+                      persistent_workers=num_workers > 0, prefetch_factor=2 if num_workers > 0 else None)
+
+
+def _train_one_epoch_amp(ae, training_loader, optimizer, loss_function, device, amp_dtype, use_amp, scaler):
+    """
+    Trains the autoencoder model for one epoch, optionally with automatic mixed precision.
+
+    The forward pass and the loss are computed under `torch.autocast`, and the backward pass and the parameter updates
+    go through the gradient scaler (which is a no-op when disabled).
+
+    :param torch.nn.Module ae: The autoencoder model to be trained.
+    :param torch.utils.data.DataLoader training_loader: The loader of the training set.
+    :param torch.optim.Optimizer optimizer: The optimizer used for parameter updates.
+    :param torch.nn.Module loss_function: The loss function used for training.
+    :param torch.device device: The device the autoencoder is on.
+    :param torch.dtype amp_dtype: The lower precision data type used by autocast.
+    :param bool use_amp: Whether to enable autocast.
+    :param torch.amp.GradScaler scaler: The gradient scaler.
+
+    :return: The average training loss of the epoch.
+    :rtype: float
+    """
+    running_loss = 0.0
+    for data in training_loader:
+        inputs = data.to(device, non_blocking=True)
+        optimizer.zero_grad()
+        with torch.autocast(device_type=device.type, dtype=amp_dtype, enabled=use_amp):
+            outputs = ae(inputs)
+            loss = loss_function(outputs, inputs)
+        scaler.scale(loss).backward()
+        scaler.step(optimizer)
+        scaler.update()
+        running_loss += loss.item()
+    return running_loss / len(training_loader)
+
+
+def _fit_torch_mlp(syn_pts, y_syn_pts, device, steps=300, lr=1e-3):
+    """
+    Trains a small PyTorch MLP to predict the "local-fit" reliability of the synthetic points.
+
+    The MLP (one hidden layer of 64 tanh units) is trained on the specified device (the device of the autoencoder),
+    with full-batch Adam updates; on CUDA (only if the caller moved the autoencoder there, since `train_autoencoder`
+    returns it on the CPU), the forward pass runs under float16 autocast with gradient scaling. The synthetic points
+    and their labels are moved to the device once. The initial weights are drawn with a fixed seed from a forked CPU
+    random state, so the global random state is left untouched.
+
+    :param array-like syn_pts: The synthetic points.
+    :param array-like y_syn_pts: The "local-fit" reliability labels of the synthetic points (1 reliable, 0 unreliable).
+    :param torch.device device: The device the MLP is trained and kept on.
+    :param int steps: The number of optimization steps (default: 300).
+    :param float lr: The learning rate of the Adam optimizer (default: 1e-3).
+
+    :return: The trained MLP, on the training device.
+    :rtype: torch.nn.Sequential
+    """
+    X_t = torch.as_tensor(np.asarray(syn_pts), dtype=torch.float32, device=device)
+    y_t = torch.as_tensor(np.asarray(y_syn_pts), dtype=torch.long, device=device)
+
+    with torch.random.fork_rng(devices=[]):
+        torch.default_generator.manual_seed(42)
+        model = torch.nn.Sequential(torch.nn.Linear(X_t.shape[1], 64), torch.nn.Tanh(), torch.nn.Linear(64, 2))
+    model.to(device)
+
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    loss_function = torch.nn.CrossEntropyLoss()
+    use_amp = device.type == 'cuda'
+    scaler = torch.amp.GradScaler('cuda', enabled=use_amp)
+    model.train(True)
+    for _ in range(steps):
+        optimizer.zero_grad()
+        with torch.autocast(device_type=device.type, dtype=torch.float16, enabled=use_amp):
+            loss = loss_function(model(X_t), y_t)
+        scaler.scale(loss).backward()
+        scaler.step(optimizer)
+        scaler.update()
+    return model.eval()
+
+
+class _TorchMLPProxy:
+    """
+    Wraps a PyTorch classifier with the `predict` method of the scikit-learn proxy models.
+
+    The samples are predicted in a single forward pass on the device of the classifier, whether `predict` receives a
+    single sample or a whole dataset.
+
+    :param torch.nn.Module model: The trained classifier, returning the logits of the two classes.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.device = _module_device(model)
+
+    def predict(self, X):
+        """
+        Predicts the "local-fit" reliability of the samples.
+
+        :param array-like X: A sample, or a dataset with shape (n_samples, n_features).
+
+        :return: A numpy 1-D array containing the predicted reliability of each sample (1 reliable, 0 unreliable).
+        :rtype: numpy.ndarray
+        """
+        X = np.asarray(X)
+        with torch.inference_mode():
+            X_t = torch.as_tensor(X, dtype=torch.float32, device=self.device).reshape(-1, X.shape[-1])
+            return self.model(X_t).argmax(dim=1).cpu().numpy()
+
+
+def _density_reliability(RD, X):
+    """
+    Computes the density reliability of the samples in a dataset, comparing their reconstruction MSE with the MSE
+    threshold of the detector.
+
+    If the detector does not expose an autoencoder (`ae`) and an MSE threshold (`mse_thresh`), its
+    `compute_density_reliability` method is called on each sample instead. In the batched path, a sample is reliable
+    if its reconstruction MSE, computed in float32, is strictly below the threshold.
+
+    :param ReliabilityDetector RD: A ReliabilityPackage object.
+    :param numpy.ndarray X: the specified dataset
+
+    :return: a numpy 1-D array containing the density reliability of each sample (1 for reliable, 0 for unreliable)
+    :rtype: numpy.ndarray
+    """
+    ae = getattr(RD, 'ae', None)
+    mse_thresh = getattr(RD, 'mse_thresh', None)
+    if not isinstance(ae, torch.nn.Module) or mse_thresh is None:
+        with torch.inference_mode():
+            return np.asarray([RD.compute_density_reliability(x) for x in X])
+    return (_reconstruction_mse(ae, X) < mse_thresh).numpy().astype(int)
+
+
+def _localfit_reliability(RD, X):
+    """
+    Computes the local-fit reliability of the samples in a dataset with a single prediction of the proxy model of the
+    detector.
+
+    If the detector does not expose a proxy model (`clf`) with a `predict` method, its `compute_localfit_reliability`
+    method is called on each sample instead.
+
+    :param ReliabilityDetector RD: A ReliabilityPackage object.
+    :param numpy.ndarray X: the specified dataset
+
+    :return: a numpy 1-D array containing the local-fit reliability of each sample (1 for reliable, 0 for unreliable)
+    :rtype: numpy.ndarray
+    """
+    clf = getattr(RD, 'clf', None)
+    if not hasattr(clf, 'predict'):
         return np.asarray([RD.compute_localfit_reliability(x) for x in X])
+    return np.asarray(clf.predict(X)).astype(int)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _is_integer_column(col):
+        """
+        Checks whether a column contains only integer values.
+
+        Non-finite values (NaN, +inf, -inf) are not considered integers, so a column containing them is treated as
+        continuous. The check is a single pass over the column (strided views are read in place, without copies),
+        compiled with Numba, which stops at the first non-integer value.
+
+        :param numpy.ndarray col: The column of interest.
+
+        :return: True if all the values of the column are finite integers, False otherwise.
+        :rtype: bool
+        """
+        for i in range(col.size):
+            if not np.isfinite(col[i]) or col[i] != np.floor(col[i]):
+                return False
+        return True
+else:
+    def _is_integer_column(col):
+        """
+        Checks whether a column contains only integer values, with the same rule of the Numba version (non-finite
+        values are not integers), vectorized with NumPy.
+
+        :param numpy.ndarray col: The column of interest.
+
+        :return: True if all the values of the column are finite integers, False otherwise.
+        :rtype: bool
+        """
+        return bool(np.all(np.isfinite(col) & (col == np.floor(col))))
+
+
+def _values_probabilities(col):
+    """
+    Computes the distinct values of a column and their relative frequencies.
+
+    :param numpy.ndarray col: The column of interest.
+
+    :return: A tuple containing the distinct values of the column and the corresponding relative frequencies.
+    :rtype: tuple
+    """
+    vals, counts = np.unique(col, return_counts=True)
+    return vals, counts / counts.sum()
+
+
+def _module_device(module):
+    """
+    Gets the device of a PyTorch module, i.e. the device of its first parameter.
+
+    Frozen TorchScript modules have no parameters left; the ones built by `freeze_ae` are always on the CPU.
+
+    :param torch.nn.Module module: The module of interest.
+
+    :return: The device of the module.
+    :rtype: torch.device
+    """
+    param = next(module.parameters(), None)
+    return param.device if param is not None else torch.device('cpu')
+
+
+def _reconstruction_mse(ae, X, chunk_size=8192):
+    """
+    Computes the reconstruction MSE of each sample of a dataset for a given autoencoder model.
+
+    The samples are forwarded through the autoencoder in batches of at most `chunk_size` rows, instead of one at a
+    time, and the squared errors are reduced along the features.
+
+    :param torch.nn.Module ae: The autoencoder model.
+    :param numpy.ndarray X: The dataset of interest with shape (n_samples, n_features).
+    :param int chunk_size: The maximum number of samples forwarded through the autoencoder at once (default: 8192).
+
+    :return: A 1-D tensor containing the reconstruction MSE of each sample.
+    :rtype: torch.Tensor
+    """
+    device = _module_device(ae)
+    with torch.inference_mode():
+        X_t = torch.as_tensor(np.asarray(X)).float().to(device)
+        mse = [((ae(chunk) - chunk) ** 2).mean(dim=1) for chunk in torch.split(X_t, chunk_size)]
+        return torch.cat(mse).cpu()